@@ -0,0 +1,247 @@
+"""
+Optional Numba-accelerated kernels for the core technical indicators.
+
+When numba is installed, the functions below are JIT-compiled (with on-disk
+caching, so the compile cost is paid once per machine) and compute SMA, RSI
+and MACD in tight loops over the raw close array. This avoids the separate
+Python-to-C crossing and fresh output allocation that each individual TA-Lib
+call pays, which dominates on typical daily-bar series of a few thousand
+points. When numba is missing, the decorator degrades to a no-op and callers
+should stay on the TA-Lib path.
+
+The NaN warm-up layout of every output matches the corresponding TA-Lib
+function, so the two paths are interchangeable for downstream dropna logic.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in so the module still imports without numba."""
+        def wrap(func):
+            return func
+        if args and callable(args[0]):
+            return args[0]
+        return wrap
+
+
+@njit(cache=True, fastmath=True)
+def _sma(x, n):
+    """Simple moving average with a running sum (one add/subtract per step)."""
+    out = np.full(x.size, np.nan)
+    s = 0.0
+    for i in range(x.size):
+        s += x[i]
+        if i >= n:
+            s -= x[i - n]
+        if i >= n - 1:
+            out[i] = s / n
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def _rsi(x, n):
+    """Wilder-smoothed RSI, matching TA-Lib's warm-up (first n values NaN)."""
+    out = np.full(x.size, np.nan)
+    if x.size <= n:
+        return out
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, n + 1):
+        d = x[i] - x[i - 1]
+        if d > 0.0:
+            avg_gain += d
+        else:
+            avg_loss -= d
+    avg_gain /= n
+    avg_loss /= n
+    denom = avg_gain + avg_loss
+    out[n] = 100.0 * avg_gain / denom if denom > 0.0 else 50.0
+    for i in range(n + 1, x.size):
+        d = x[i] - x[i - 1]
+        gain = d if d > 0.0 else 0.0
+        loss = -d if d < 0.0 else 0.0
+        avg_gain = (avg_gain * (n - 1) + gain) / n
+        avg_loss = (avg_loss * (n - 1) + loss) / n
+        denom = avg_gain + avg_loss
+        out[i] = 100.0 * avg_gain / denom if denom > 0.0 else 50.0
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def _macd(x, fast, slow, signal):
+    """MACD line/signal/histogram with SMA-seeded EMAs (TA-Lib convention)."""
+    n = x.size
+    macd = np.full(n, np.nan)
+    sig = np.full(n, np.nan)
+    hist = np.full(n, np.nan)
+    if n < slow + signal - 1:
+        return macd, sig, hist
+    a_fast = 2.0 / (fast + 1)
+    a_slow = 2.0 / (slow + 1)
+    a_sig = 2.0 / (signal + 1)
+    # TA-Lib seeds both EMAs with an SMA ending on the same bar (slow - 1),
+    # which is what makes the output bit-compatible with ta.MACD.
+    ema_fast = np.mean(x[slow - fast:slow])
+    ema_slow = np.mean(x[:slow])
+    ema_sig = 0.0
+    sig_sum = 0.0
+    sig_seen = 0
+    for i in range(slow - 1, n):
+        if i >= slow:
+            v = x[i]
+            ema_fast = a_fast * v + (1.0 - a_fast) * ema_fast
+            ema_slow = a_slow * v + (1.0 - a_slow) * ema_slow
+        d = ema_fast - ema_slow
+        if sig_seen < signal:
+            sig_sum += d
+            sig_seen += 1
+            if sig_seen == signal:
+                ema_sig = sig_sum / signal
+        else:
+            ema_sig = a_sig * d + (1.0 - a_sig) * ema_sig
+        if sig_seen >= signal:
+            macd[i] = d
+            sig[i] = ema_sig
+            hist[i] = d - ema_sig
+    return macd, sig, hist
+
+
+@njit(cache=True, boundscheck=False, fastmath=True)
+def all_indicators(close):
+    """
+    Compute SMA_20, SMA_50, RSI_14, MACD(12, 26, 9) and 20-period
+    Bollinger Bands (2 standard deviations) for one close series.
+
+    The close array is streamed exactly once: both SMA running sums, the
+    sum of squares for the Bollinger standard deviation, the Wilder
+    gain/loss averages and the three EMAs all live in scalar registers,
+    so the input is read 1x instead of once per TA-Lib call.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        (sma20, sma50, rsi14, macd, macd_signal, macd_hist,
+         upper_bb, middle_bb, lower_bb)
+    """
+    n = close.size
+    sma20 = np.full(n, np.nan)
+    sma50 = np.full(n, np.nan)
+    rsi14 = np.full(n, np.nan)
+    macd = np.full(n, np.nan)
+    macdsignal = np.full(n, np.nan)
+    macdhist = np.full(n, np.nan)
+    upper_bb = np.full(n, np.nan)
+    middle_bb = np.full(n, np.nan)
+    lower_bb = np.full(n, np.nan)
+
+    a_fast = 2.0 / 13.0   # EMA(12)
+    a_slow = 2.0 / 27.0   # EMA(26)
+    a_sig = 2.0 / 10.0    # EMA(9)
+
+    s20 = 0.0
+    s20_sq = 0.0
+    s50 = 0.0
+    avg_gain = 0.0
+    avg_loss = 0.0
+    sum_fast = 0.0
+    sum_slow = 0.0
+    ema_fast = 0.0
+    ema_slow = 0.0
+    ema_sig = 0.0
+    sig_sum = 0.0
+    sig_seen = 0
+
+    for i in range(n):
+        v = close[i]
+
+        # SMA_20 / SMA_50: subtract-oldest, add-newest running sums. The
+        # running sum of squares gives the 20-period population standard
+        # deviation for the Bollinger Bands from the same window.
+        s20 += v
+        s20_sq += v * v
+        if i >= 20:
+            old = close[i - 20]
+            s20 -= old
+            s20_sq -= old * old
+        if i >= 19:
+            m = s20 / 20.0
+            sma20[i] = m
+            var = s20_sq / 20.0 - m * m
+            if var < 0.0:
+                var = 0.0
+            dev = 2.0 * np.sqrt(var)
+            middle_bb[i] = m
+            upper_bb[i] = m + dev
+            lower_bb[i] = m - dev
+        s50 += v
+        if i >= 50:
+            s50 -= close[i - 50]
+        if i >= 49:
+            sma50[i] = s50 / 50.0
+
+        # RSI_14: Wilder smoothing seeded from the first 14 deltas.
+        if i >= 1:
+            d = v - close[i - 1]
+            gain = d if d > 0.0 else 0.0
+            loss = -d if d < 0.0 else 0.0
+            if i <= 14:
+                avg_gain += gain
+                avg_loss += loss
+                if i == 14:
+                    avg_gain /= 14.0
+                    avg_loss /= 14.0
+                    denom = avg_gain + avg_loss
+                    rsi14[i] = 100.0 * avg_gain / denom if denom > 0.0 else 50.0
+            else:
+                avg_gain = (avg_gain * 13.0 + gain) / 14.0
+                avg_loss = (avg_loss * 13.0 + loss) / 14.0
+                denom = avg_gain + avg_loss
+                rsi14[i] = 100.0 * avg_gain / denom if denom > 0.0 else 50.0
+
+        # MACD(12, 26, 9): TA-Lib seeds both EMAs with an SMA ending on
+        # bar 25, so the fast sum only starts accumulating at bar 14.
+        if i < 26:
+            sum_slow += v
+            if i >= 14:
+                sum_fast += v
+        if i == 25:
+            ema_slow = sum_slow / 26.0
+            ema_fast = sum_fast / 12.0
+        elif i > 25:
+            ema_fast = a_fast * v + (1.0 - a_fast) * ema_fast
+            ema_slow = a_slow * v + (1.0 - a_slow) * ema_slow
+        if i >= 25:
+            d = ema_fast - ema_slow
+            if sig_seen < 9:
+                sig_sum += d
+                sig_seen += 1
+                if sig_seen == 9:
+                    ema_sig = sig_sum / 9.0
+            else:
+                ema_sig = a_sig * d + (1.0 - a_sig) * ema_sig
+            if sig_seen >= 9:
+                macd[i] = d
+                macdsignal[i] = ema_sig
+                macdhist[i] = d - ema_sig
+
+    return sma20, sma50, rsi14, macd, macdsignal, macdhist, upper_bb, middle_bb, lower_bb
+
+
+@njit(cache=True)
+def _returns(close):
+    """Simple returns in one pass, with the leading NaN pct_change leaves.
+
+    pct_change allocates a shift buffer plus a difference buffer; this
+    writes straight into a single output array.
+    """
+    out = np.empty_like(close)
+    if close.size:
+        out[0] = np.nan
+    for i in range(1, close.size):
+        out[i] = close[i] / close[i - 1] - 1.0
+    return out
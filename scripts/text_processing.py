@@ -1,16 +1,24 @@
 """
 Reusable text preprocessing and topic-modeling helpers.
 """
+import functools
+import hashlib
+import multiprocessing as mp
+import os
+import pickle
 import re
+from collections import Counter
+from pathlib import Path
 import pandas as pd
 import numpy as np
+import tldextract
 from gensim import corpora, models
 # VADER is much faster than TextBlob for lexicon-based analysis
 from nltk.sentiment.vader import SentimentIntensityAnalyzer
 from typing import List, Optional, Tuple
 
 # Hardcoded Stopwords (bypasses NLTK LookupError)
-STOP = set((
+STOP = frozenset((
     'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', "you're", 
     "you've", "you'll", "you'd", 'your', 'yours', 'yourself', 'yourselves', 'he', 
     'him', 'his', 'himself', 'she', "she's", 'her', 'hers', 'herself', 'it', 
@@ -33,29 +41,90 @@ STOP = set((
     "wouldn't", 'com', 'org', 'www'
 ))
 
+# Precompiled patterns for clean_text: compiling once at module load avoids
+# the per-call regex cache lookups, and the fused ticker alternation does the
+# (NASDAQ:AAPL) / $AAPL / URL removal in a single pass over the string.
+_TICKER_RE = re.compile(r'\(\w+:\w+\)|\$\w+|http\S+')
+_NONALPHA_RE = re.compile(r'[^a-z\s]+')
 
+# On-disk cache for prepared dictionaries/corpora (see prepare_corpus
+# use_cache); shared with the finance-side price/indicator caches.
+_CACHE_DIR = Path(os.path.expanduser("~")) / ".cache" / "week1-news-sentiment"
+
+# Single shared extractor built at import: it lazy-loads the bundled
+# public-suffix snapshot once (no network fetch) instead of once per call.
+_TLD = tldextract.TLDExtract(suffix_list_urls=(), fallback_to_snapshot=True)
+
+# Lazy module-level VADER instance: constructing the analyzer reloads the
+# lexicon file from disk, so it should happen once per process, not per call.
+_VADER: Optional[SentimentIntensityAnalyzer] = None
+
+
+def _get_vader() -> SentimentIntensityAnalyzer:
+    """Return the shared SentimentIntensityAnalyzer, creating it on first use."""
+    global _VADER
+    if _VADER is None:
+        _VADER = SentimentIntensityAnalyzer()
+    return _VADER
+
+
+def _score_one(text: str) -> dict:
+    """Score a single text with the per-process VADER singleton.
+
+    Defined at module level so it pickles for multiprocessing workers;
+    each worker pays the lexicon load once via _get_vader().
+    """
+    return _get_vader().polarity_scores(text)
+
+# Below this corpus size the fork/pickle overhead of a worker pool costs
+# more than single-core VADER scoring saves.
+_MIN_PARALLEL_TEXTS = 2000
+
+
+@functools.lru_cache(maxsize=200_000)
 def clean_text(text: str) -> str:
     """
     Cleans text by converting to lowercase, removing specific patterns, 
     punctuation, numbers, and extra whitespace.
+
+    Results are memoized: wire-service reprints make duplicate headlines
+    common, and a cache hit skips the whole regex pipeline.
     """
-    if pd.isna(text):
+    # Cheap identity/NaN guard: pd.isna dispatches through pandas'
+    # type-inference machinery, which is microseconds per scalar; NaN is
+    # the only float that compares unequal to itself.
+    if text is None or text is pd.NA or (isinstance(text, float) and text != text):
         return ""
-        
+
+
     text = str(text).lower()
-    
-    # 1. REMOVE TICKET SYMBOLS: E.g., $AAPL, (NASDAQ:TSLA)
+
+    # 1. REMOVE TICKER SYMBOLS: E.g., $AAPL, (NASDAQ:TSLA)
     # This prevents noise from financial symbols in topic modeling.
-    text = re.sub(r'\(\w+:\w+\)', ' ', text) # Removes (NASDAQ:AAPL)
-    text = re.sub(r'\$\w+', ' ', text)        # Removes $AAPL
-    
-    # 2. Remove punctuation, numbers, and non-alphanumeric symbols
-    text = re.sub(r'[^a-z\s]', ' ', text)
-    
-    # 3. Replace multiple spaces with a single space
-    text = re.sub(r'\s+', ' ', text).strip()
-    
-    return text
+    text = _TICKER_RE.sub(' ', text)
+
+    # 2. Strip punctuation/numbers/symbols and collapse whitespace in one
+    # go: str.split() is a C-level tokenizer, so no third regex pass.
+    return ' '.join(_NONALPHA_RE.sub(' ', text).split())
+
+
+def _clean_series(s: pd.Series) -> pd.Series:
+    """clean_text over a whole Series, staying inside pandas' C string kernels."""
+    s = s.str.lower()
+    s = s.str.replace(_TICKER_RE, ' ', regex=True)
+    return s.str.replace(_NONALPHA_RE, ' ', regex=True)
+
+
+def clean_text_batch(texts: List[str]) -> List[str]:
+    """
+    Vectorized clean_text for a batch of texts.
+
+    Prefer this over [clean_text(t) for t in texts] on large corpora:
+    the regex passes run once over a contiguous string array instead of
+    per element.
+    """
+    s = pd.Series(texts, dtype="string[pyarrow]").fillna("")
+    return [' '.join(t.split()) for t in _clean_series(s)]
 
 
 def headline_length(df: pd.DataFrame, col='headline') -> pd.DataFrame:
@@ -82,14 +151,18 @@ def headline_length(df: pd.DataFrame, col='headline') -> pd.DataFrame:
     [2, 1]
     """
     s = df[col].fillna("").astype(str)
-    chars = s.str.len()
-    tokens = s.apply(lambda t: len(t.split()))
-    return pd.DataFrame({'chars': chars, 'tokens': tokens})
+    # Vectorized counts in pandas' C string kernels; int32 halves the
+    # memory of the returned frame (headlines never overflow 2B).
+    chars = s.str.len().astype('int32')
+    tokens = s.str.count(r'\S+').astype('int32')
+    return pd.DataFrame({'chars': chars, 'tokens': tokens}, index=df.index)
 
 
+@functools.lru_cache(maxsize=200_000)
 def publisher_domain(publisher: str) -> str:
     """
     Extract domain-like part if email-like or url-like publisher is given.
+    Memoized, since the same publisher string repeats across thousands of rows.
     
     Examples
     --------
@@ -98,20 +171,49 @@ def publisher_domain(publisher: str) -> str:
     >>> publisher_domain("www.the-financial-times.co.uk/news")
     'the-financial-times.co.uk'
     """
-    import tldextract
     if pd.isna(publisher):
         return ""
     p = str(publisher).strip()
     # if email-like
     if "@" in p:
         return p.split("@")[-1].lower()
-    # try tldextract
-    ex = tldextract.extract(p)
-    if ex.domain:
-        return f"{ex.domain}.{ex.suffix}" if ex.suffix else ex.domain
+    return _url_domain(p)
+
+
+def _url_domain(p: str) -> str:
+    """Resolve a non-email publisher string via the shared tldextract instance."""
+    ex = _TLD(p)
+    if ex.domain and ex.suffix:
+        return f"{ex.domain}.{ex.suffix}".lower()
     return p.lower()
 
 
+def publisher_domain_series(s: pd.Series) -> pd.Series:
+    """
+    Vectorized publisher_domain for a whole Series.
+
+    The email branch (the common case in this dataset) runs entirely in
+    pandas' C string kernels; only the URL-like remainder falls back to the
+    per-value tldextract lookup.
+
+    Examples
+    --------
+    >>> publisher_domain_series(pd.Series(["user@example.com", None])).tolist()
+    ['example.com', '']
+    """
+    s = s.fillna("").astype(str).str.strip()
+    out = pd.Series("", index=s.index, dtype=object)
+    is_email = s.str.contains("@", regex=False)
+    out[is_email] = s[is_email].str.split("@").str[-1].str.lower()
+    rest = ~is_email & (s != "")
+    # One str.extract sweep pulls the netloc out of scheme'd URLs, so the
+    # per-value tldextract fallback only ever sees a bare host and skips
+    # its internal URL parsing; non-URL values pass through unchanged.
+    hosts = s[rest].str.extract(r'//([^/\s]+)', expand=False).fillna(s[rest])
+    out[rest] = hosts.map(_url_domain)
+    return out
+
+
 class NewsCorpusProcessor:
     """
     Manages the processing of a news corpus, including text cleaning,
@@ -125,7 +227,8 @@ class NewsCorpusProcessor:
     corpus : Optional[list of list of tuple]
         Gensim corpus (Bag-of-Words representation) after preparation.
     texts_tok : Optional[list of list of str]
-        Tokenized and cleaned texts.
+        Tokenized and cleaned texts (only retained when prepare_corpus is
+        called with keep_tokens=True).
 
     Examples
     --------
@@ -138,36 +241,146 @@ class NewsCorpusProcessor:
     """
     def __init__(self, texts: Optional[List[str]] = None):
         """Initializes the processor and stores the text list."""
-        # Store the raw text list
+        # Store the corpus once as an Arrow-backed string Series so every
+        # downstream vectorized .str sweep reads contiguous UTF-8 buffers
+        # instead of re-boxing N Python strings.
         self.texts = texts
-        
+
         # Attributes for LDA
         self.dictionary = None
         self.corpus = None
 
-    def prepare_corpus(self, 
-                       no_below: int = 5, 
-                       no_above: float = 0.9, 
-                       keep_n: int = 10000) -> None:
+    @property
+    def texts(self) -> Optional[List[str]]:
+        """Original texts as a plain Python list (back-compat accessor)."""
+        if self._texts_series is None:
+            return None
+        return self._texts_series.tolist()
+
+    @texts.setter
+    def texts(self, value: Optional[List[str]]) -> None:
+        self._texts_series = (
+            pd.Series(value, dtype="string[pyarrow]") if value is not None else None
+        )
+
+    def _iter_tokens(self):
+        """Yield one filtered token list per document, never all at once.
+
+        Peak memory is O(longest document) instead of O(total tokens);
+        the price is re-running the clean/split chain on every pass, so
+        this backs the low_memory path of prepare_corpus only.
+        """
+        for text in self._texts_series.fillna(""):
+            toks = clean_text(text).split()
+            yield [w for w in toks if len(w) > 2 and w not in STOP]
+
+    def prepare_corpus(self,
+                       no_below: int = 5,
+                       no_above: float = 0.9,
+                       keep_n: int = 10000,
+                       keep_tokens: bool = False,
+                       low_memory: bool = False,
+                       use_cache: bool = False) -> None:
         """
         Tokenizes texts, creates a Gensim Dictionary, and generates a Corpus.
         It uses the texts stored in self.texts.
+
+        By default the intermediate token lists are released once the
+        Bag-of-Words corpus is built, roughly halving peak memory for the
+        LDA step; pass keep_tokens=True to retain them on self.texts_tok
+        (e.g. for coherence scoring). With low_memory=True the tokens are
+        streamed through a generator twice (once for the dictionary, once
+        for the corpus) and never materialized, trading an extra clean
+        pass for O(longest doc) peak memory; keep_tokens is ignored then.
+
+        With use_cache=True the prepared dictionary and corpus are saved
+        under ~/.cache/week1-news-sentiment/ keyed on a digest of the
+        texts and filter parameters, so repeat runs over the same corpus
+        load two small files instead of re-tokenizing everything.
         """
         # Ensure texts are available
-        if self.texts is None:
+        if self._texts_series is None:
             raise ValueError("Text corpus (self.texts) is empty. Initialize the class with a list of texts.")
-        
 
-        texts_tok = [[w for w in clean_text(t).split() if w not in STOP and len(w) > 2] for t in self.texts]
+        cache_base = None
+        if use_cache:
+            key_src = "\n".join(self._texts_series.fillna("").tolist())
+            key = hashlib.blake2b(
+                f"{key_src}|{no_below}|{no_above}|{keep_n}".encode(), digest_size=8
+            ).hexdigest()
+            cache_base = _CACHE_DIR / f"corpus_{key}"
+            dict_path = cache_base.with_suffix(".dict")
+            bow_path = cache_base.with_suffix(".bow.pkl")
+            if dict_path.exists() and bow_path.exists():
+                self.dictionary = corpora.Dictionary.load(str(dict_path))
+                with open(bow_path, "rb") as f:
+                    self.corpus = pickle.load(f)
+                self.texts_tok = None
+                return
+
+        if low_memory:
+            dictionary = corpora.Dictionary(self._iter_tokens())
+            dictionary.filter_extremes(no_below=no_below, no_above=no_above, keep_n=keep_n)
+            token2id = dictionary.token2id
+            self.dictionary = dictionary
+            self.corpus = [
+                sorted(
+                    (i, c)
+                    for i, c in ((token2id.get(w), c) for w, c in Counter(toks).items())
+                    if i is not None
+                )
+                for toks in self._iter_tokens()
+            ]
+            self.texts_tok = None
+            self._save_corpus_cache(cache_base)
+            return
+
+        # Vectorized clean+tokenize: the lowercase/regex/split chain runs in
+        # pandas' C string kernels over the whole corpus instead of one
+        # Python-level clean_text call per document.
+        tokens = _clean_series(self._texts_series.fillna("")).str.split()
+        # len(w) > 2 is a cheap int compare that short-circuits before the
+        # set hash lookup and already rejects most stopwords.
+        texts_tok = [[w for w in toks if len(w) > 2 and w not in STOP] for toks in tokens]
         dictionary = corpora.Dictionary(texts_tok)
         dictionary.filter_extremes(no_below=no_below, no_above=no_above, keep_n=keep_n)
-        corpus = [dictionary.doc2bow(text) for text in texts_tok]
+
+        # Equivalent to doc2bow per document, but with the token->id dict
+        # bound to a local and without gensim's per-call update/validation
+        # branches; tokens pruned by filter_extremes map to None and drop out.
+        token2id = dictionary.token2id
+        corpus = [
+            sorted(
+                (i, c)
+                for i, c in ((token2id.get(w), c) for w, c in Counter(toks).items())
+                if i is not None
+            )
+            for toks in texts_tok
+        ]
         
         self.dictionary = dictionary
         self.corpus = corpus
-        self.texts_tok = texts_tok
+        # Only the (id, count) corpus is needed for LDA; the string token
+        # lists are ~2x its size and are dropped unless explicitly requested.
+        self.texts_tok = texts_tok if keep_tokens else None
+        self._save_corpus_cache(cache_base)
 
-    def lda_topics(self, num_topics: int = 6, passes: int = 6) -> Tuple[models.LdaModel, List[str]]:
+    def _save_corpus_cache(self, cache_base) -> None:
+        """Persist the prepared dictionary and corpus (best effort)."""
+        if cache_base is None:
+            return
+        try:
+            _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            self.dictionary.save(str(cache_base.with_suffix(".dict")))
+            with open(cache_base.with_suffix(".bow.pkl"), "wb") as f:
+                pickle.dump(self.corpus, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError:
+            # The cache is an optimization, never a hard requirement.
+            pass
+
+    def lda_topics(self, num_topics: int = 6, passes: int = 6,
+                   workers: Optional[int] = None,
+                   deterministic: bool = False) -> Tuple[models.LdaModel, List[str]]:
         """
         Trains an LDA model using the stored dictionary and corpus.
 
@@ -177,7 +390,15 @@ class NewsCorpusProcessor:
             The number of topics to discover.
         passes : int
             Number of passes through the corpus during training.
-            
+        workers : int, optional
+            Worker processes for LdaMulticore; defaults to cpu_count() - 1.
+            The per-document E-step parallelizes near-linearly up to the
+            physical core count.
+        deterministic : bool
+            If True, train with the single-threaded LdaModel instead.
+            LdaMulticore is numerically close but not bit-identical across
+            runs, so flip this when exact reproducibility matters.
+
         Returns
         -------
         tuple: (models.LdaModel, list of str)
@@ -185,14 +406,30 @@ class NewsCorpusProcessor:
         """
         if self.corpus is None or self.dictionary is None:
             raise ValueError("Corpus and dictionary must be prepared before running LDA. Call prepare_corpus() first.")
-            
-        lda_model = models.LdaModel(
-            self.corpus,
-            num_topics=num_topics,
-            id2word=self.dictionary,
-            passes=passes,
-            random_state=42 # for reproducibility
-        )
+
+        # Tiny corpora train single-threaded: below ~100 documents the
+        # worker process startup and chunk dispatch cost more than the
+        # E-step they would parallelize.
+        if deterministic or len(self.corpus) < 100:
+            lda_model = models.LdaModel(
+                self.corpus,
+                num_topics=num_topics,
+                id2word=self.dictionary,
+                passes=passes,
+                random_state=42 # for reproducibility
+            )
+        else:
+            if workers is None:
+                workers = max(1, (os.cpu_count() or 2) - 1)
+            lda_model = models.LdaMulticore(
+                self.corpus,
+                num_topics=num_topics,
+                id2word=self.dictionary,
+                passes=passes,
+                random_state=42,
+                workers=workers,
+                chunksize=2000,
+            )
         
         # Format the topics for printing
         topics = []
@@ -202,31 +439,48 @@ class NewsCorpusProcessor:
             
         return lda_model, topics
     
-    def calculate_sentiment(self) -> pd.DataFrame:
+    def calculate_sentiment(self, cores: Optional[int] = None) -> pd.DataFrame:
         """
         Calculates sentiment scores (Compound, Pos, Neu, Neg) for all texts
         in the corpus using VADER.
 
+        Parameters
+        ----------
+        cores : int, optional
+            Number of worker processes for scoring. Defaults to
+            os.cpu_count(). VADER is pure Python and GIL-bound, so large
+            corpora are sharded across processes; small corpora are scored
+            serially where a pool would only add overhead.
+
         Returns
         -------
         pd.DataFrame
             DataFrame with 'vader_compound', 'vader_pos', 'vader_neg', 'vader_neu' columns.
         """
-        if self.texts is None:
+        if self._texts_series is None:
             raise ValueError("Text corpus (self.texts) is empty.")
-            
-        # Initialize VADER
-        analyzer = SentimentIntensityAnalyzer()
-        
-        # Apply the VADER analysis function to each text
-        # This returns a dictionary of scores {'neg', 'neu', 'pos', 'compound'}
-        sentiment_results = [analyzer.polarity_scores(text) for text in self.texts]
-        
-        # Convert list of dictionaries into a DataFrame
-        sentiment_df = pd.DataFrame(sentiment_results)
-        
-        # Rename and reorder columns
-        sentiment_df.columns = ['vader_neg', 'vader_neu', 'vader_pos', 'vader_compound']
-        sentiment_df = sentiment_df[['vader_compound', 'vader_pos', 'vader_neg', 'vader_neu']]
-        
+
+        if cores is None:
+            cores = os.cpu_count() or 1
+
+        # Materialize to Python strings only at the VADER handoff; missing
+        # values score as empty text rather than crashing the analyzer.
+        texts = self._texts_series.fillna("").tolist()
+
+        # The scores are dictionaries of {'neg', 'neu', 'pos', 'compound'}
+        if cores > 1 and len(texts) >= _MIN_PARALLEL_TEXTS:
+            chunksize = max(1, len(texts) // (cores * 4))
+            with mp.Pool(cores) as pool:
+                sentiment_results = pool.map(_score_one, texts, chunksize=chunksize)
+        else:
+            analyzer = _get_vader()
+            sentiment_results = [analyzer.polarity_scores(text) for text in texts]
+
+        # Build the DataFrame in the target column order directly instead of
+        # constructing, renaming, and reindexing in three steps.
+        sentiment_df = pd.DataFrame(
+            sentiment_results,
+            columns=['compound', 'pos', 'neg', 'neu'],
+        ).rename(columns=lambda c: f'vader_{c}')
+
         return sentiment_df
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""
+Shared fixtures for the test suite.
+
+yfinance.download is patched for the whole session with a caching wrapper:
+the first request for a (ticker, start, end, interval) combination hits the
+network once and is stored as Parquet under tests/.cache/; every later
+request - in this run or the next - is served from disk. That makes the
+tests that use real market data deterministic and network-free after one
+populated run. If the cache is cold and the network is down, the wrapper
+raises instead of handing back the empty frame yfinance returns silently,
+so fixtures can skip cleanly.
+
+Tests that mock yfinance themselves simply patch over this wrapper.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+import yfinance
+
+_CACHE_DIR = Path(__file__).parent / ".cache"
+_REAL_DOWNLOAD = yfinance.download
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "xdist_group(name): keep these tests on one pytest-xdist worker "
+        "(they share the on-disk yfinance cache)",
+    )
+
+
+def _make_mock_stock_df(num_days=60):
+    """Deterministic price frame long enough for the SMA_50 lookback."""
+    dates = pd.date_range(start='2024-01-01', periods=num_days, freq='D')
+    # Simple, non-random price data for predictable indicator results.
+    # One linspace allocation; the other columns are broadcast offsets
+    # from it instead of three more independent ramps.
+    base = np.linspace(100, 150, num_days)
+    data = {
+        'Open': base,
+        'High': base + 1,
+        'Low': base - 1,
+        'Close': base + 0.5,
+    }
+    df = pd.DataFrame(data, index=dates)
+    df.index.name = 'Date'
+    return df
+
+
+# Built once per session; tests take shallow copies instead of rebuilding
+# the date range and the four price arrays per test.
+MOCK_STOCK_DF = _make_mock_stock_df()
+
+
+@pytest.fixture(scope="session")
+def mock_stock_data():
+    """Shared mock price frame; copy before mutating."""
+    return MOCK_STOCK_DF
+
+
+def _cached_download(ticker, *args, start=None, end=None, interval="1d", **kwargs):
+    """Serve a yfinance download from the test cache, populating it on miss."""
+    path = _CACHE_DIR / f"{ticker}_{start}_{end}_{interval}.parquet"
+    if path.exists():
+        return pd.read_parquet(path)
+    df = _REAL_DOWNLOAD(ticker, *args, start=start, end=end, interval=interval, **kwargs)
+    if df is None or df.empty:
+        raise ConnectionError(
+            f"yfinance returned no data for {ticker!r} and no cached copy exists"
+        )
+    _CACHE_DIR.mkdir(exist_ok=True)
+    df.to_parquet(path)
+    return df
+
+
+@pytest.fixture(autouse=True)
+def fresh_price_memo():
+    """Clear StockAnalyzer's in-process price memo between tests.
+
+    Without this, a test re-using another test's (ticker, start, end)
+    would be served from the memo and its download mock would never
+    fire, breaking assert_called_once.
+    """
+    from scripts.finance_tools import StockAnalyzer
+
+    StockAnalyzer._load_price_cached.cache_clear()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def cached_yf():
+    """Route all yfinance downloads through the on-disk test cache."""
+    mp = pytest.MonkeyPatch()
+    mp.setattr("yfinance.download", _cached_download)
+    yield
+    mp.undo()
@@ -8,37 +8,26 @@ from datetime import date
 # Ensure the scripts directory is on the path for importing
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts')))
 
-from scripts.finance_tools import StockAnalyzer
+from scripts.finance_tools import StockAnalyzer, batch_analyze
+from tests.conftest import MOCK_STOCK_DF
 
 # --- Fixtures / Mock Data ---
 
-# Create a deterministic mock DataFrame for yfinance download
-# We need at least 50 data points for SMA_50 to calculate, but we'll use 60 for buffer.
-@pytest.fixture
-def mock_stock_data():
-    """Generates a mock DataFrame suitable for testing TA-Lib indicators."""
-    num_days = 60
-    dates = pd.date_range(start='2024-01-01', periods=num_days, freq='D')
-    # Create simple, non-random price data for predictable indicator results (Close, Open, High, Low)
-    data = {
-        'Open': np.linspace(100, 150, num_days),
-        'High': np.linspace(101, 151, num_days),
-        'Low': np.linspace(99, 149, num_days),
-        'Close': np.linspace(100.5, 150.5, num_days)
-    }
-    df = pd.DataFrame(data, index=dates)
-    df.index.name = 'Date'
-    return df
+# The deterministic 60-row mock frame (enough for the SMA_50 lookback) is
+# built once in tests/conftest.py and shared via the session-scoped
+# mock_stock_data fixture.
+
 
 # Helper to mock the yfinance download function
 def mock_download(*args, **kwargs):
     """Mocks yfinance.download to return a fixed, predictable DataFrame."""
-    return mock_stock_data()
+    # Shallow copy: only the BlockManager is cloned, data buffers are shared.
+    return MOCK_STOCK_DF.copy(deep=False)
 
 
 # --- Tests for StockAnalyzer ---
 
-@patch('yfinance.download', side_effect=mock_download)
+@patch('scripts.finance_tools.yf.download', side_effect=mock_download)
 def test_stock_analyzer_init(mock_download_func, mock_stock_data):
     """Test that the StockAnalyzer initializes and loads data correctly."""
     analyzer = StockAnalyzer(ticker='TEST')
@@ -52,10 +41,10 @@ def test_stock_analyzer_init(mock_download_func, mock_stock_data):
     assert 'Close' in analyzer.df.columns
     assert 'Date' == analyzer.df.index.name
     
-@patch('yfinance.download', side_effect=mock_download)
-def test_add_indicators_creates_columns(_mock_download_func, _mock_stock_data):
+def test_add_indicators_creates_columns():
     """Test that add_indicators adds all required TA-Lib columns."""
-    analyzer = StockAnalyzer(ticker='TEST')
+    # No download involved: inject the mock frame directly.
+    analyzer = StockAnalyzer.from_dataframe(MOCK_STOCK_DF.copy(deep=False), ticker='TEST')
     analyzer.add_indicators()
     
     # Expected columns from finance_tools.py
@@ -64,7 +53,7 @@ def test_add_indicators_creates_columns(_mock_download_func, _mock_stock_data):
     for col in expected_cols:
         assert col in analyzer.df.columns, f"Missing expected indicator column: {col}"
     
-@patch('yfinance.download', side_effect=mock_download)
+@patch('scripts.finance_tools.yf.download', side_effect=mock_download)
 def test_add_indicators_initial_nan_handling(mock_download_func, mock_stock_data):
     """Test that TA-Lib correctly handles initial NaN values for indicators based on their period."""
     analyzer = StockAnalyzer(ticker='TEST')
@@ -97,22 +86,19 @@ def test_add_indicators_initial_nan_handling(mock_download_func, mock_stock_data
     # It should be 60 total rows - 49 initial NaNs = 11 calculated values.
     assert non_nan_count == expected_non_nan_count, f"Expected {expected_non_nan_count} non-NaN values for SMA_50, got {non_nan_count}"
 
-@patch('yfinance.download', side_effect=mock_download)
-def test_add_indicators_insufficient_data(mock_download_func):
+def test_add_indicators_insufficient_data():
     """Test that add_indicators raises ValueError when data is insufficient (e.g., < 50 rows)."""
-    # Override mock data to return only 40 rows
-    short_data = mock_stock_data()[:40]
-
-    with patch('yfinance.download', return_value=short_data):
-        analyzer = StockAnalyzer(ticker='SHORT')
-        mock_download_func.assert_called_once()
-        # The add_indicators method is expected to raise a ValueError due to the check in finance_tools.py
-        with pytest.raises(ValueError) as excinfo:
-            analyzer.add_indicators()
-            
-        assert "Not enough clean data (only 40 points) for TA-Lib indicators" in str(excinfo.value)
-
-@patch('yfinance.download', side_effect=mock_download)
+    # Only 40 rows, below the SMA_50 lookback
+    short_data = MOCK_STOCK_DF.iloc[:40]
+
+    analyzer = StockAnalyzer.from_dataframe(short_data, ticker='SHORT')
+    # The add_indicators method is expected to raise a ValueError due to the check in finance_tools.py
+    with pytest.raises(ValueError) as excinfo:
+        analyzer.add_indicators()
+
+    assert "Not enough clean data (only 40 points) for TA-Lib indicators" in str(excinfo.value)
+
+@patch('scripts.finance_tools.yf.download', side_effect=mock_download)
 def test_add_returns(mock_download_func, mock_stock_data):
     """Test that add_returns calculates the daily return and drops the initial NaN."""
     analyzer = StockAnalyzer(ticker='TEST')
@@ -126,7 +112,7 @@ def test_add_returns(mock_download_func, mock_stock_data):
     # Check that the 'Return' column contains no NaNs
     assert processed_df['Return'].isnull().sum() == 0
 
-@patch('yfinance.download', side_effect=mock_download)
+@patch('scripts.finance_tools.yf.download', side_effect=mock_download)
 def test_add_indicators_result_size(mock_download_func, mock_stock_data):
     """Test that add_indicators results in a clean DataFrame with the correct number of rows (after dropping TA-Lib NaNs)."""
     analyzer = StockAnalyzer(ticker='TEST')
@@ -140,4 +126,16 @@ def test_add_indicators_result_size(mock_download_func, mock_stock_data):
     assert len(processed_df) == expected_size, f"Expected {expected_size} rows, got {len(processed_df)}"
     
     # Check that the 'SMA_50' column contains no NaNs
-    assert processed_df['SMA_50'].isnull().sum() == 0
\ No newline at end of file
+    assert processed_df['SMA_50'].isnull().sum() == 0
+
+@patch('scripts.finance_tools.yf.download', side_effect=mock_download)
+def test_batch_analyze(mock_download_func):
+    """Test that batch_analyze returns an indicator frame per ticker."""
+    results = batch_analyze(['AAA', 'BBB'], max_workers=2)
+
+    assert set(results) == {'AAA', 'BBB'}
+    assert mock_download_func.call_count == 2
+    for df in results.values():
+        assert 'SMA_50' in df.columns
+        # 60 mock rows minus the 49-row SMA_50 warmup
+        assert len(df) == len(MOCK_STOCK_DF) - 49
\ No newline at end of file
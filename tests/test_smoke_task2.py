@@ -33,6 +33,9 @@ def stock_analyzer():
     except Exception as e:
         pytest.skip(f"Could not load real stock data (yfinance/network issue): {e}")
 
+# Grouped so xdist's loadgroup scheduler never runs two workers against
+# the shared tests/.cache yfinance store at once.
+@pytest.mark.xdist_group("yf_cache")
 def test_e2e_workflow(stock_analyzer):
     """
     Tests the sequence: Load Price -> Add Indicators -> Text Processing.